@@ -11,28 +11,37 @@ saving a cached parsed object and phenotype summary for downstream analysis.
 
 - Object-oriented architecture with single-responsibility components
 - Structured logging to file + console (durations, step markers, emojis)
-- Optional system resource monitoring (CPU/mem/disk deltas per step) via psutil
+- Optional system resource monitoring via psutil (CPU/mem/disk report, per-step RSS deltas)
 - Dual parsing strategy for GEOparse (filename-GEOID + explicit GEO fallback)
+- Uncompressed, memory-mapped GSE cache by default (shared page cache, low RSS)
+- Optional LZ4-compressed archival cache via --compress-cache (zlib level 1 if lz4 is missing)
+- Lightweight per-sample metadata sidecar (orjson + zstd) so inspection/summary skip unpickling
 - Config-aware (uses config.py if available), else sensible defaults
+- Optional parallel phenotype record building across samples (joblib/loky, --jobs)
 - CLI flags to customize GEO ID, sample index, and monitoring behavior
 - SOLID Principles implemented in this design
 
 Usage:
   python s00005_geo_inspector.py \
     --geo_id GSE40279 \
-    --sample_index 0
+    --sample_index 0 \
+    [--jobs -1] [--compress-cache]
 
 Output Files:
 1) Downloaded SOFT archive (.soft.gz)
    <data_dir>/s00005_<GEO_ID>_family.soft.gz
 
-2) Parsed GSE object cache
-   <data_dir>/s00005_<GEO_ID>_gse_object.joblib
+2) Parsed GSE object caches
+   <data_dir>/s00005_<GEO_ID>_gse_object.joblib   (full object, incl. per-sample data tables)
+   <data_dir>/s00005_<GEO_ID>_gse_meta.joblib     (slim: metadata only, tables dropped)
 
-3) Parsed phenotype CSV (auto-parsed from 'characteristics_ch1')
+3) Per-sample metadata sidecar (when orjson + zstandard are installed)
+   <data_dir>/s00005_<GEO_ID>_gsms_meta.json.zst
+
+4) Parsed phenotype CSV (auto-parsed from 'characteristics_ch1')
    <results_dir>/s00005_<GEO_ID>_phenotypes.csv
 
-4) Structured log file
+5) Structured log file
    <results_dir>/s00005_download_dataset_<GEO_ID>.txt
 """
 
@@ -40,18 +49,51 @@ Output Files:
 import os                   # For file path and directory operations
 import argparse             # For parsing command-line arguments
 import logging              # For logging output to file and console
+import logging.handlers     # For buffered (batched) log file writes
+import atexit               # For flushing buffered logs on interpreter exit
 import shutil               # For disk usage and file management
+import copy                 # For building the slim (table-free) GSE cache
+import pickle               # For selecting the cache pickle protocol
 import time                 # For timing code execution
 from datetime import timedelta, datetime  # For formatting time durations & timestamps
+import csv                  # For streaming phenotype rows to disk
 from collections import Counter           # For counting phenotype values
-from typing import Optional, Dict, Any
+from itertools import islice              # For lazily taking the first few metadata keys
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator
 
 # === External packages ===
 import GEOparse             # For downloading and parsing GEO datasets
 import joblib               # For caching/loading parsed GSE objects
-import pandas as pd         # For phenotype CSV export
+import pandas as pd         # For empty placeholder tables in the slim GSE cache
 import psutil               # For monitoring CPU and memory usage
 
+# Optional lz4 (fast archival cache compression, see --compress-cache). joblib registers the "lz4" compressor
+# automatically when the package is importable; otherwise fall back to low-level zlib.
+try:
+    import lz4  # noqa: F401
+    _CACHE_COMPRESS = ("lz4", 1)
+except ImportError:
+    _CACHE_COMPRESS = ("zlib", 1)
+
+# Write GSE caches with the highest pickle protocol the interpreter supports.
+_CACHE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# Optional pyarrow (C++ CSV writer); falls back to csv.DictWriter.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
+# Optional orjson + zstandard (fast metadata sidecar); without them the full GSE object is used.
+try:
+    import orjson
+    import zstandard
+    _META_SIDECAR_AVAILABLE = True
+except ImportError:
+    _META_SIDECAR_AVAILABLE = False
+
 # === Project-specific config file (with path constants) ===
 # Try to import; fall back to sensible defaults if not present.
 _DEFAULT_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -65,6 +107,14 @@ except Exception:
 os.makedirs(data_dir, exist_ok=True)
 os.makedirs(results_dir, exist_ok=True)
 
+# Suppress very verbose GEOparse DEBUG logs unless needed (global; set once at import)
+logging.getLogger("GEOparse").setLevel(logging.WARNING)
+
+
+# Samples per loky task; GSEs with fewer than n_jobs * this many samples are parsed serially,
+# since worker startup and IPC would outweigh the microseconds of work per sample.
+_PARSE_BATCH_SIZE = 256
+
 
 # === Utility Function ===
 def format_duration(seconds: float) -> str:
@@ -72,6 +122,64 @@ def format_duration(seconds: float) -> str:
     return str(timedelta(seconds=round(seconds)))
 
 
+def write_csv_rows(rows: Iterable[Dict[str, str]], columns: List[str], path: str,
+                   batch_size: int = 1024) -> None:
+    """
+    Stream dict rows to CSV (missing keys -> empty cells), holding at most one batch in memory.
+    `columns` must already cover every key in `rows`; it is used as a fixed schema so neither
+    writer scans rows to discover keys or infer types. Uses pyarrow's CSVWriter when available,
+    else csv.DictWriter. Both write UTF-8 with every cell quoted and '\n' line endings, so the
+    output bytes do not depend on which writer ran.
+    """
+    if not _PYARROW_AVAILABLE:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            # extrasaction="ignore" skips DictWriter's per-row extra-key set difference
+            writer = csv.DictWriter(f, fieldnames=columns, restval="", extrasaction="ignore",
+                                    quoting=csv.QUOTE_ALL, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        return
+
+    def to_batch(batch: List[Dict[str, str]]):
+        # missing keys become "" (not null) so they are quoted like the DictWriter fallback
+        return pa.RecordBatch.from_arrays(
+            [pa.array([row.get(col, "") for row in batch], type=pa.string()) for col in columns],
+            schema=schema,
+        )
+
+    schema = pa.schema([(col, pa.string()) for col in columns])
+    options = pa_csv.WriteOptions(quoting_style="all_valid")
+    with pa_csv.CSVWriter(path, schema, write_options=options) as writer:
+        batch: List[Dict[str, str]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(to_batch(batch))
+                batch.clear()
+        if batch:
+            writer.write_batch(to_batch(batch))
+
+
+def _split_characteristic(item: str) -> Tuple[Optional[str], str]:
+    """
+    Split a 'key: value' characteristic into (normalized column key, raw value); key is None
+    when there is no ':'. Single source of the column-key rule for the schema scan and rows.
+    """
+    # partition: one scan, no list allocation; sep is '' when there is no ':'
+    k, sep, v = item.partition(":")
+    return (k.strip().lower() if sep else None), v
+
+
+def _parse_gsm(sample_id: str, meta: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    """Parse one sample's 'key: value' characteristics into (raw values, record)."""
+    record = {"sample_id": sample_id}
+    for item in meta:
+        key, value = _split_characteristic(item)
+        if key is not None:
+            record[key] = value.strip()
+    return list(meta), record
+
+
 # === Logger Interface ===
 class Logger:
     """Abstract base class for logging implementations."""
@@ -90,34 +198,44 @@ class SystemMonitor:
     """Reports system usage (CPU, memory, and disk)."""
     def __init__(self, logger: Logger):
         self.logger = logger
+        self._proc = psutil.Process()  # this process, reused for cheap per-step RSS reads
 
     def snapshot(self) -> Dict[str, Any]:
+        # Per-step snapshots only read this process's RSS (one syscall);
+        # CPU and disk are sampled in report(), where they are actually shown
+        return {"rss": self._proc.memory_info().rss}
+
+    def report(self) -> None:
         # Use psutil for CPU/memory; shutil for disk usage
         cpu = psutil.cpu_percent(interval=None)
         mem = psutil.virtual_memory()
         disk = shutil.disk_usage(".")
+        self.logger.log("🖥️ System Resource Usage:")
+        self.logger.log(f"  ⚙️ CPU: {cpu:.0f}%")
+        self.logger.log(f"  🧠 Memory: {mem.used / (1024**3):.2f}/{mem.total / (1024**3):.2f} GB")
+        self.logger.log(f"  💽 Disk: {disk.used / (1024**3):.2f}/{disk.total / (1024**3):.2f} GB\n")
+
+    @staticmethod
+    def delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
         return {
-            "cpu_percent": cpu,
-            "mem_used": mem.used,
-            "mem_total": mem.total,
-            "disk_used": disk.used,
-            "disk_total": disk.total,
+            "rss_delta": (after["rss"] - before["rss"]) / (1024**2),  # MB
         }
 
+
+class NullMonitor(SystemMonitor):
+    """No-op monitor used when monitoring is disabled (skips all psutil calls)."""
+    def __init__(self, logger: Logger):
+        self.logger = logger
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {}
+
     def report(self) -> None:
-        snap = self.snapshot()
-        self.logger.log("🖥️ System Resource Usage:")
-        self.logger.log(f"  ⚙️ CPU: {snap['cpu_percent']:.0f}%")
-        self.logger.log(f"  🧠 Memory: {snap['mem_used'] / (1024**3):.2f}/{snap['mem_total'] / (1024**3):.2f} GB")
-        self.logger.log(f"  💽 Disk: {snap['disk_used'] / (1024**3):.2f}/{snap['disk_total'] / (1024**3):.2f} GB\n")
+        pass
 
     @staticmethod
     def delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "rss_delta": (after["mem_used"] - before["mem_used"]) / (1024**2),     # MB
-            "disk_delta": (after["disk_used"] - before["disk_used"]) / (1024**2),  # MB
-            "cpu_after": after["cpu_percent"],
-        }
+        return {"rss_delta": 0.0}
 
 
 # === Step Timing Context ===
@@ -142,10 +260,9 @@ class StepTimer:
         if exc:
             logging.exception(f"❌ FAIL: {self.title} (duration {dt})")
             return False  # re-raise
-        delta = self.monitor.delta(self.before, after)
-        self.logger.log(
-            f"🔢 RSS Δ: {delta['rss_delta']:+.2f} MB | 💽 Disk Δ: {delta['disk_delta']:+.2f} MB | ⚙️ CPU: {delta['cpu_after']:.0f}%"
-        )
+        if self.before:  # empty when monitoring is disabled (NullMonitor)
+            delta = self.monitor.delta(self.before, after)
+            self.logger.log(f"🔢 RSS Δ: {delta['rss_delta']:+.2f} MB")
         self.logger.log(f"✅ DONE: {self.title} in {dt}\n")
 
 
@@ -155,19 +272,21 @@ class GeoDatasetFetcher:
     Handles download, safe parsing, inspection, phenotype summarization, and verification
     for a given GEO dataset.
     """
-    def __init__(self, geo_id: str, logger: Logger):
+    def __init__(self, geo_id: str, logger: Logger, compress_cache: bool = False, n_jobs: int = 1):
         self.geo_id = geo_id
         self.logger = logger
+        self.n_jobs = n_jobs
+        # Compressed caches cannot be memory-mapped, so the two modes are mutually exclusive
+        self.compress_cache = compress_cache
 
         # Output paths (config-aware)
         self.soft_path = os.path.join(data_dir, f"s00005_{self.geo_id}_family.soft.gz")
         self.gse_object_path = os.path.join(data_dir, f"s00005_{self.geo_id}_gse_object.joblib")
+        self.gse_meta_path = os.path.join(data_dir, f"s00005_{self.geo_id}_gse_meta.joblib")
+        self.gsms_meta_path = os.path.join(data_dir, f"s00005_{self.geo_id}_gsms_meta.json.zst")
         self.pheno_csv = os.path.join(results_dir, f"s00005_{self.geo_id}_phenotypes.csv")
         self.log_file = os.path.join(results_dir, f"s00005_download_dataset_{self.geo_id}.txt")
 
-        # Suppress very verbose GEOparse DEBUG logs unless needed
-        logging.getLogger("GEOparse").setLevel(logging.WARNING)
-
     # ---- Download ----
     def download_soft(self) -> None:
         """Download the GEO SOFT file if missing, standardize naming to soft_path."""
@@ -186,23 +305,124 @@ class GeoDatasetFetcher:
                 break
         self.logger.log("✅ Download complete.")
 
+    # ---- Cache I/O ----
+    @staticmethod
+    def _is_compressed_cache(path: str) -> bool:
+        """True if a joblib file is compressed (raw pickles start with the PROTO opcode 0x80)."""
+        with open(path, "rb") as f:
+            return f.read(1) != b"\x80"
+
+    def _load_cached_gse(self, path: str):
+        """
+        Load a cached GSE object, memory-mapping its arrays when stored uncompressed. The mmap
+        choice follows the file's actual format, so a cache written under the other
+        --compress-cache setting still loads; the mismatch is logged since the requested
+        format only takes effect when the cache is rewritten (next re-parse).
+        """
+        compressed = self._is_compressed_cache(path)
+        if compressed != self.compress_cache:
+            on_disk = "compressed" if compressed else "uncompressed"
+            self.logger.log(
+                f"ℹ️ {os.path.basename(path)} is stored {on_disk}, which does not match --compress-cache; "
+                "it will be rewritten in the requested format on the next re-parse "
+                f"(delete {os.path.basename(self.gse_object_path)} to force one)."
+            )
+        return joblib.load(path, mmap_mode=None if compressed else "r")
+
+    def _dump_cached_gse(self, gse, path: str) -> None:
+        """Persist a GSE object: raw (mmap-able) by default, compressed for archival."""
+        # joblib.load auto-detects the compressor from magic bytes, so readers need no change
+        compress = _CACHE_COMPRESS if self.compress_cache else 0
+        joblib.dump(gse, path, compress=compress, protocol=_CACHE_PROTOCOL)
+
+    @staticmethod
+    def _strip_tables(gse):
+        """Return a shallow copy of gse without per-sample/platform data tables (metadata only)."""
+        slim = copy.copy(gse)
+        slim.gsms = {}
+        for sample_id, gsm in gse.gsms.items():
+            slim_gsm = copy.copy(gsm)
+            slim_gsm.table = pd.DataFrame()
+            slim_gsm.columns = pd.DataFrame()
+            slim.gsms[sample_id] = slim_gsm
+        slim.gpls = {}
+        return slim
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[List[int]]:
+        """[mtime_ns, size] of a file, or None if missing; stamped into derived caches."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _full_cache_signature(self) -> Optional[List[int]]:
+        """Signature of the full GSE cache, or None if it is missing or older than the SOFT file."""
+        cache = self._file_signature(self.gse_object_path)
+        soft = self._file_signature(self.soft_path)
+        if cache is None or (soft is not None and soft[0] > cache[0]):
+            return None
+        return cache
+
+    def _write_sidecar(self, gsms_meta: Dict[str, Dict[str, List[str]]]) -> None:
+        """Save the per-sample metadata sidecar, stamped with the full cache it came from."""
+        if not _META_SIDECAR_AVAILABLE:
+            return
+        payload = {"source": self._file_signature(self.gse_object_path), "gsms": gsms_meta}
+        tmp_path = self.gsms_meta_path + ".part"
+        with open(tmp_path, "wb") as f:
+            f.write(zstandard.ZstdCompressor(level=3).compress(orjson.dumps(payload)))
+        os.replace(tmp_path, self.gsms_meta_path)
+        self.logger.log(f"💾 Saved sample metadata sidecar to {self.gsms_meta_path}")
+
+    def _write_slim_cache(self, gse):
+        """Save (and return) the metadata-only copy of gse, stamped with the full cache it came from."""
+        slim = self._strip_tables(gse)
+        payload = {"source": self._file_signature(self.gse_object_path), "gse": slim}
+        self._dump_cached_gse(payload, self.gse_meta_path)
+        self.logger.log(f"💾 Saved slim (metadata-only) GSE object to {self.gse_meta_path}")
+        return slim
+
+    def _load_slim_cache(self):
+        """Return the slim GSE object if it was derived from the current full cache, else None."""
+        source = self._full_cache_signature()
+        if source is None or not os.path.exists(self.gse_meta_path):
+            return None
+        try:
+            payload = self._load_cached_gse(self.gse_meta_path)
+        except Exception as e:
+            self.logger.log(f"⚠️ Failed to load slim GSE cache ({e})")
+            return None
+        if not isinstance(payload, dict) or payload.get("source") != source:
+            self.logger.log("⚠️ Slim GSE cache is stale (full cache changed since it was written)")
+            return None
+        return payload["gse"]
+
     # ---- Parse or load cached GSE ----
-    def load_or_parse_gse(self):
-        """Load cached GSE object; else parse from SOFT using dual-approach naming/explicit GEO."""
+    def _load_full_cache(self):
+        """Return the cached full GSE object, or None if it is missing, unreadable, or stale."""
+        if os.path.exists(self.gse_object_path) and self._full_cache_signature() is None:
+            self.logger.log("⚠️ SOFT file is newer than the cached GSE object, will parse from SOFT...")
+            return None
         try:
             self.logger.log("📦 Attempting to load cached GSE object...")
-            gse = joblib.load(self.gse_object_path)
+            gse = self._load_cached_gse(self.gse_object_path)
             assert hasattr(gse, "gsms") and len(gse.gsms) > 0
             self.logger.log(f"⚡ Using cached GSE object — {len(gse.gsms)} samples.")
             return gse
         except Exception as e:
             self.logger.log(f"⚠️ Failed to load GSE object, will parse from SOFT... ({e})")
+            return None
 
+    def _parse_soft(self):
+        """Parse from SOFT using dual-approach naming/explicit GEO, then rewrite every cache."""
         # Option 2 (preferred): GEOparse expects filename starting with GEO ID
         dir_name = os.path.dirname(self.soft_path)
         friendly_name = f"{self.geo_id}_family.soft.gz"
         friendly_path = os.path.join(dir_name, friendly_name)
-        if not os.path.exists(friendly_path):
+        friendly_sig = self._file_signature(friendly_path)
+        if friendly_sig is None or self._file_signature(self.soft_path)[0] > friendly_sig[0]:
             shutil.copy(self.soft_path, friendly_path)
             self.logger.log(f"📄 Created GEOparse-friendly copy: {friendly_path}")
 
@@ -213,79 +433,159 @@ class GeoDatasetFetcher:
             # Option 1 fallback: Explicit GEO param
             gse = GEOparse.get_GEO(filepath=self.soft_path, GEO=self.geo_id)
 
-        joblib.dump(gse, self.gse_object_path, compress=("zlib", 3))
+        self._dump_cached_gse(gse, self.gse_object_path)
         self.logger.log(f"💾 Re-saved parsed GSE object to {self.gse_object_path}")
+        slim = self._write_slim_cache(gse)
+        self._write_sidecar({sample_id: gsm.metadata for sample_id, gsm in slim.gsms.items()})
         return gse
 
+    def load_or_parse_gse(self, slim: bool = False):
+        """
+        Load cached GSE object; else parse from SOFT using dual-approach naming/explicit GEO.
+        With slim=True, return the metadata-only object; the slim cache is used only while it
+        matches the current full cache, and is rebuilt from it (or from a fresh parse) otherwise.
+        """
+        if slim:
+            gse = self._load_slim_cache()
+            if gse is not None:
+                self.logger.log(f"⚡ Using slim cached GSE object — {len(gse.gsms)} samples.")
+                return gse
+            gse = self._load_full_cache()
+            if gse is None:
+                return self._strip_tables(self._parse_soft())
+            return self._write_slim_cache(gse)
+
+        gse = self._load_full_cache()
+        return gse if gse is not None else self._parse_soft()
+
+    # ---- Per-sample metadata (sidecar or full object) ----
+    def load_gsms_metadata(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Return {sample_id: metadata} for all samples. Reads the compressed JSON sidecar while it
+        matches the current full cache; otherwise uses the slim GSE cache (or parses) and
+        rewrites the sidecar.
+        """
+        source = self._full_cache_signature()
+        if source is not None and _META_SIDECAR_AVAILABLE and os.path.exists(self.gsms_meta_path):
+            try:
+                with open(self.gsms_meta_path, "rb") as f:
+                    payload = orjson.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+                if isinstance(payload, dict) and payload.get("source") == source:
+                    gsms_meta = payload["gsms"]
+                    self.logger.log(f"⚡ Using cached sample metadata — {len(gsms_meta)} samples.")
+                    return gsms_meta
+                self.logger.log("⚠️ Sample metadata sidecar is stale, falling back to GSE object...")
+            except Exception as e:
+                self.logger.log(f"⚠️ Failed to load sample metadata sidecar, falling back to GSE object... ({e})")
+
+        gse = self.load_or_parse_gse(slim=True)
+        gsms_meta = {sample_id: gsm.metadata for sample_id, gsm in gse.gsms.items()}
+        # A re-parse (full cache rewritten) already wrote a fresh sidecar
+        if self._full_cache_signature() == source:
+            self._write_sidecar(gsms_meta)
+        return gsms_meta
+
     # ---- Inspect one sample ----
-    def inspect_sample(self, gse, sample_index: int = 0) -> None:
+    def _log_sample(self, sample_index: int, sample_id: str, meta: Dict[str, List[str]]) -> None:
         """Log a quick view of one sample's first few metadata fields."""
-        sample_id = list(gse.gsms.keys())[sample_index]
-        gsm = gse.gsms[sample_id]
         self.logger.log(f"🔬 Sample {sample_index}: {sample_id}")
-        for key in list(gsm.metadata.keys())[:5]:
-            self.logger.log(f"  {key}: {gsm.metadata[key]}")
+        for key in islice(meta, 5):
+            self.logger.log(f"  {key}: {meta[key]}")
         self.logger.log("")
 
     # ---- Summarize phenotypes + CSV export ----
-    def summarize_phenotypes(self, gse, field: str = "characteristics_ch1") -> None:
-        """Summarize phenotype labels and export an auto-parsed CSV (one row per sample)."""
-        values = []
-        rows = []
-        for sample_id, gsm in gse.gsms.items():
-            record = {"sample_id": sample_id}
-            meta = gsm.metadata.get(field)
-            if meta:
-                values.extend(meta)
-                for item in meta:
-                    if ":" in item:
-                        k, v = item.split(":", 1)
-                        record[k.strip().lower()] = v.strip()
-            rows.append(record)
+    def _iter_parsed_gsms(self, gsms_meta: Dict[str, Dict[str, List[str]]],
+                          field: str) -> Iterator[Tuple[List[str], Dict[str, str]]]:
+        """Yield _parse_gsm results in sample order, in parallel for large GSEs when n_jobs > 1."""
+        items = ((sample_id, meta.get(field) or []) for sample_id, meta in gsms_meta.items())
+        if self.n_jobs > 1 and len(gsms_meta) >= self.n_jobs * _PARSE_BATCH_SIZE:
+            # GSMs are independent; loky workers parse them in batches and results stream back in order
+            return iter(joblib.Parallel(n_jobs=self.n_jobs, backend="loky", batch_size=_PARSE_BATCH_SIZE,
+                                        return_as="generator")(
+                joblib.delayed(_parse_gsm)(sample_id, meta) for sample_id, meta in items
+            ))
+        return (_parse_gsm(sample_id, meta) for sample_id, meta in items)
+
+    def inspect_and_summarize(self, gsms_meta: Dict[str, Dict[str, List[str]]], sample_index: int = 0,
+                              field: str = "characteristics_ch1") -> None:
+        """
+        Inspect one sample, then summarize phenotype labels + export an auto-parsed CSV (one row
+        per sample). Makes two passes over the samples: the first logs the inspected sample and
+        collects the CSV columns, the second parses, counts, and streams the rows (so each
+        'key: value' item is partitioned once per pass). The column scan stays serial, since the
+        header must be known before the first row is written; --jobs only parallelizes the
+        second pass (record building), so its gain is bounded by that half of the work.
+        """
+        n_samples = len(gsms_meta)
+        pos = sample_index + n_samples if sample_index < 0 else sample_index
+        if not 0 <= pos < n_samples:
+            raise IndexError(f"sample_index {sample_index} out of range for {n_samples} samples")
+
+        # Pass 1: inspect the requested sample and collect column names (first-seen order),
+        # giving the writers an explicit schema so rows can be streamed straight to disk
+        seen_cols: List[str] = ["sample_id"]
+        seen: set = {"sample_id"}
+        for i, (sample_id, meta) in enumerate(gsms_meta.items()):
+            if i == pos:
+                self._log_sample(sample_index, sample_id, meta)
+            for item in meta.get(field) or []:
+                key, _ = _split_characteristic(item)
+                if key is not None and key not in seen:
+                    seen.add(key)
+                    seen_cols.append(key)
+
+        # Pass 2: parse, count, and write each row as it is produced (no per-sample list held)
+        counter: Counter = Counter()
+
+        def records() -> Iterator[Dict[str, str]]:
+            for values, record in self._iter_parsed_gsms(gsms_meta, field):
+                counter.update(values)
+                yield record
+
+        write_csv_rows(records(), seen_cols, self.pheno_csv)
 
         # counts (raw)
-        counter = Counter(values)
         self.logger.log(f"📊 Metadata summary: {field}")
         for label, count in counter.items():
             self.logger.log(f"  {label}: {count}")
         self.logger.log("")
 
-        # export parsed phenotype table
-        df = pd.DataFrame(rows)
-        df.to_csv(self.pheno_csv, index=False)
         self.logger.log(f"📄 Parsed phenotype CSV saved to: {self.pheno_csv}\n")
 
     # ---- Verify cached object ----
-    def verify_gse_object(self) -> None:
-        """Verify that the cached object exists and can be loaded."""
+    def verify_gse_object(self, n_samples: int) -> None:
+        """
+        Verify that the cached objects exist. The caller already holds the sample metadata,
+        so its sample count is reported instead of reloading a cache from disk.
+        """
         self.logger.log("🔍 Final verification of parsed GSE object")
-        if os.path.exists(self.gse_object_path):
-            self.logger.log(f"✅ File exists: {self.gse_object_path}")
-            try:
-                gse = joblib.load(self.gse_object_path)
-                self.logger.log("✅ GSE object loaded.")
-                self.logger.log(f"🔢 Samples loaded: {len(gse.gsms)}")
-                self.logger.log(f"📑 Metadata keys: {list(gse.metadata.keys())[:5]}")
-            except Exception as e:
-                self.logger.log(f"❌ Failed to load GSE object: {e}")
-        else:
-            self.logger.log("❌ Parsed GSE object not found.")
+        for path in (self.gse_object_path, self.gse_meta_path):
+            if os.path.exists(path):
+                self.logger.log(f"✅ File exists: {path}")
+            else:
+                self.logger.log(f"❌ Parsed GSE object not found: {path}")
+        self.logger.log(f"🔢 Samples loaded: {n_samples}")
         self.logger.log("✅ Dataset inspection complete.\n")
 
 
 # === CLI / Runner ===
 def configure_logging(log_file: str) -> None:
     """Configure logging to file + console, simple line-based format for easy grep/parse."""
-    logging.basicConfig(
-        filename=log_file,
-        filemode="w",
-        level=logging.INFO,
-        format="%(message)s"
-    )
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+
+    # File output is buffered and written in batches (or immediately on ERROR) to keep
+    # synchronous disk writes off the step hot path; the console stays unbuffered.
+    file_handler = logging.FileHandler(log_file, mode="w")
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    buffered = logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=file_handler)
+    root.addHandler(buffered)
+    atexit.register(buffered.flush)
+
     console = logging.StreamHandler()
     console.setLevel(logging.INFO)
     console.setFormatter(logging.Formatter("%(message)s"))
-    logging.getLogger().addHandler(console)
+    root.addHandler(console)
 
 
 def main():
@@ -293,38 +593,41 @@ def main():
     parser.add_argument("--geo_id", type=str, default="GSE40279", help="GEO accession ID (e.g., GSE40279)")
     parser.add_argument("--sample_index", type=int, default=0, help="Sample index to inspect")
     parser.add_argument("--no-monitor", action="store_true", help="Disable system resource monitoring logs")
+    parser.add_argument("--jobs", type=int, default=max(1, (os.cpu_count() or 1) // 2),
+                        help="Worker processes for building phenotype records (1 = serial, -1 = all cores); "
+                             "the column scan is always serial, and small GSEs are parsed serially")
+    parser.add_argument("--compress-cache", action="store_true",
+                        help="Store the GSE cache compressed (archival; disables memory-mapped loading)")
     args = parser.parse_args()
+    if args.jobs == -1:
+        args.jobs = os.cpu_count() or 1
+    elif args.jobs < 1:
+        parser.error("--jobs must be a positive integer or -1 (all cores)")
 
     # Configure logging with dataset-specific filename
     log_path = os.path.join(results_dir, f"s00005_download_dataset_{args.geo_id}.txt")
     configure_logging(log_path)
     logger = FileLogger()
 
-    # Optional monitor (enabled by default)
-    monitor = SystemMonitor(logger)
+    # Optional monitor (enabled by default); NullMonitor makes every step skip psutil entirely
+    monitor = NullMonitor(logger) if args.no_monitor else SystemMonitor(logger)
     logger.log(f"🕒 Run started: {datetime.now().isoformat(timespec='seconds')}")
     logger.log(f"📝 Log file: {log_path}\n")
-    if not args.no_monitor:
-        monitor.report()
+    monitor.report()
 
-    fetcher = GeoDatasetFetcher(args.geo_id, logger)
+    fetcher = GeoDatasetFetcher(args.geo_id, logger, compress_cache=args.compress_cache, n_jobs=args.jobs)
 
     # Execute steps with timing + resource deltas
     try:
         with StepTimer("Download SOFT file", monitor, logger):
             fetcher.download_soft()
 
-        with StepTimer("Parse or load GSE object", monitor, logger):
-            gse = fetcher.load_or_parse_gse()
-
-        with StepTimer("Inspect one sample", monitor, logger):
-            fetcher.inspect_sample(gse, sample_index=args.sample_index)
-
-        with StepTimer("Summarize phenotype field", monitor, logger):
-            fetcher.summarize_phenotypes(gse)
+        with StepTimer("Load sample metadata (parse or load GSE object if needed)", monitor, logger):
+            gsms_meta = fetcher.load_gsms_metadata()
 
-        with StepTimer("Verify GSE object", monitor, logger):
-            fetcher.verify_gse_object()
+        with StepTimer("GSE traversal (inspect sample, summarize phenotypes, verify)", monitor, logger):
+            fetcher.inspect_and_summarize(gsms_meta, sample_index=args.sample_index)
+            fetcher.verify_gse_object(len(gsms_meta))
 
     except Exception as e:
         logger.log(f"❌ Execution failed: {e}")
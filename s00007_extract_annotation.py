@@ -11,11 +11,13 @@ annotation data, applying rpy2-based RDA loading and CSV export when available.
 
 - Object-oriented architecture with single-responsibility components
 - Structured logging to file + console (durations, step markers, emojis)
-- Optional system resource monitoring (CPU/mem/disk deltas per step) via psutil
+- Optional system resource monitoring via psutil (CPU/mem/disk report, per-step RSS deltas)
+- Streamed archive download (constant memory, ~1 MiB chunks), revalidated via ETag
 - Safe extraction with path traversal guard
 - rpy2-enabled optional RDA loading and merge -> CSV export
+  (done entirely in R via data.table::fwrite when data.table is installed)
 - Config-aware (uses config.py if available), else sensible defaults
-- CLI flags to customize URL/paths/behavior
+- CLI flags to customize URL/paths/behavior (including --no-monitor)
 - SOLID Principles implemented in this design
 
 Usage:
@@ -24,8 +26,9 @@ Usage:
     --url https://bioconductor.org/packages/release/data/annotation/src/contrib/IlluminaHumanMethylation450kanno.ilmn12.hg19_0.6.1.tar.gz
 
 Output Files:
-1) Downloaded archive (.tar.gz)
+1) Downloaded archive (.tar.gz) + its HTTP ETag (for conditional re-download)
    <data_dir>/Illumina450k_annotation.tar.gz
+   <data_dir>/Illumina450k_annotation.tar.gz.etag
 
 2) Extracted package directory
    <data_dir>/s00007_<tag>_annotation/
@@ -42,8 +45,11 @@ Output Files:
 import os                   # For file path and directory operations
 import argparse             # For parsing command-line arguments
 import logging              # For logging output to file and console
+import logging.handlers     # For buffered (batched) log file writes
+import atexit               # For flushing buffered logs on interpreter exit
 import shutil               # For disk usage monitoring
 import tarfile              # For extracting .tar.gz archives safely
+from pathlib import Path    # For recursive RDA file discovery
 import time                 # For timing code execution
 from datetime import timedelta, datetime  # For formatting time durations
 from collections import Counter           # For counting phenotype values (not used here but kept per request)
@@ -79,6 +85,23 @@ os.makedirs(data_dir, exist_ok=True)
 os.makedirs(results_dir, exist_ok=True)
 
 
+# pandas2ri.activate() mutates global converter state; done once, lazily, by the pandas
+# fallback path only, so a failure there surfaces in that step and never affects rpy2 detection.
+_PANDAS2RI_ACTIVATED = False
+
+
+def _activate_pandas2ri() -> None:
+    """Activate rpy2's pandas converter on first use."""
+    global _PANDAS2RI_ACTIVATED
+    if not _PANDAS2RI_ACTIVATED:
+        pandas2ri.activate()
+        _PANDAS2RI_ACTIVATED = True
+
+
+# Chunk size for streamed HTTP downloads (bytes)
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
 # === Utility Function ===
 def format_duration(seconds: float) -> str:
     """Format a duration in seconds as hh:mm:ss."""
@@ -103,34 +126,44 @@ class SystemMonitor:
     """Reports system usage (CPU, memory, and disk)."""
     def __init__(self, logger: Logger):
         self.logger = logger
+        self._proc = psutil.Process()  # this process, reused for cheap per-step RSS reads
 
     def snapshot(self) -> Dict[str, Any]:
+        # Per-step snapshots only read this process's RSS (one syscall);
+        # CPU and disk are sampled in report(), where they are actually shown
+        return {"rss": self._proc.memory_info().rss}
+
+    def report(self) -> None:
         # Use psutil for CPU/memory; shutil for disk usage
         cpu = psutil.cpu_percent(interval=None)
         mem = psutil.virtual_memory()
         disk = shutil.disk_usage(".")
+        self.logger.log("🖥️ System Resource Usage:")
+        self.logger.log(f"  ⚙️ CPU: {cpu:.0f}%")
+        self.logger.log(f"  🧠 Memory: {mem.used / (1024**3):.2f}/{mem.total / (1024**3):.2f} GB")
+        self.logger.log(f"  💽 Disk: {disk.used / (1024**3):.2f}/{disk.total / (1024**3):.2f} GB\n")
+
+    @staticmethod
+    def delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
         return {
-            "cpu_percent": cpu,
-            "mem_used": mem.used,
-            "mem_total": mem.total,
-            "disk_used": disk.used,
-            "disk_total": disk.total,
+            "rss_delta": (after["rss"] - before["rss"]) / (1024**2),  # MB
         }
 
+
+class NullMonitor(SystemMonitor):
+    """No-op monitor used when monitoring is disabled (skips all psutil calls)."""
+    def __init__(self, logger: Logger):
+        self.logger = logger
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {}
+
     def report(self) -> None:
-        snap = self.snapshot()
-        self.logger.log("🖥️ System Resource Usage:")
-        self.logger.log(f"  ⚙️ CPU: {snap['cpu_percent']:.0f}%")
-        self.logger.log(f"  🧠 Memory: {snap['mem_used'] / (1024**3):.2f}/{snap['mem_total'] / (1024**3):.2f} GB")
-        self.logger.log(f"  💽 Disk: {snap['disk_used'] / (1024**3):.2f}/{snap['disk_total'] / (1024**3):.2f} GB\n")
+        pass
 
     @staticmethod
     def delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "rss_delta": (after["mem_used"] - before["mem_used"]) / (1024**2),     # MB
-            "disk_delta": (after["disk_used"] - before["disk_used"]) / (1024**2),  # MB
-            "cpu_after": after["cpu_percent"],
-        }
+        return {"rss_delta": 0.0}
 
 
 # === Step Timing Context ===
@@ -155,10 +188,9 @@ class StepTimer:
         if exc:
             logging.exception(f"❌ FAIL: {self.title} (duration {dt})")
             return False  # re-raise
-        delta = self.monitor.delta(self.before, after)
-        self.logger.log(
-            f"🔢 RSS Δ: {delta['rss_delta']:+.2f} MB | 💽 Disk Δ: {delta['disk_delta']:+.2f} MB | ⚙️ CPU: {delta['cpu_after']:.0f}%"
-        )
+        if self.before:  # empty when monitoring is disabled (NullMonitor)
+            delta = self.monitor.delta(self.before, after)
+            self.logger.log(f"🔢 RSS Δ: {delta['rss_delta']:+.2f} MB")
         self.logger.log(f"✅ DONE: {self.title} in {dt}\n")
 
 
@@ -206,17 +238,24 @@ class AnnotationInspector:
         self.logger.log(f"🌐 URL: {self.url}")
         self.logger.log(f"🧪 process_rda: {self.process_rda}")
         self.logger.log(f"🧩 rpy2_available: {self.rpy2_ok}")
-        SystemMonitor(self.logger).report()
+        self.monitor.report()
 
     # ---- Public API ----
     def run(self) -> None:
         with StepTimer("Step 1 - Download annotation archive", self.monitor, self.logger):
-            self._download_if_needed(self.url, self.tar_path, self.timeout)
+            self.logger.log(self._download_if_needed(self.url, self.tar_path, self.timeout))
 
         with StepTimer("Step 2 - Extract .tar.gz archive", self.monitor, self.logger):
             self._safe_extract(self.tar_path, self.extract_dir)
 
-        if self.process_rda and self.rpy2_ok:
+        if self.process_rda and self.rpy2_ok and self._r_has_data_table():
+            # Fast path: join + CSV export stay in R (data.table), no rpy2 -> pandas copy
+            with StepTimer("Step 3 - Merge and export annotation CSV (data.table)", self.monitor, self.logger):
+                loc_path, other_path = self._discover_rda(self.extract_dir)
+                self._merge_and_export_in_r(loc_path, other_path, self.output_csv)
+                self.logger.log(f"📄 Saved: {self.output_csv}")
+        elif self.process_rda and self.rpy2_ok:
+            self.logger.log("ℹ️ R package data.table not installed; falling back to pandas merge/export.")
             with StepTimer("Step 3 - Load and convert RDA files", self.monitor, self.logger):
                 loc_path, other_path = self._discover_rda(self.extract_dir)
                 locations_df, other_df = self._load_rda_to_dfs(loc_path, other_path)
@@ -234,13 +273,46 @@ class AnnotationInspector:
 
     # ---- Private helpers ----
     @staticmethod
-    def _download_if_needed(url: str, out_path: str, timeout: int = 60) -> None:
-        if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
-            return
-        resp = requests.get(url, timeout=timeout)
-        resp.raise_for_status()
-        with open(out_path, "wb") as f:
-            f.write(resp.content)
+    def _download_if_needed(url: str, out_path: str, timeout: int = 60) -> str:
+        """Download or revalidate the archive; return a one-line status message for the log."""
+        etag_path = out_path + ".etag"
+        have_file = os.path.exists(out_path) and os.path.getsize(out_path) > 0
+        headers = {}
+        if have_file:
+            if not os.path.exists(etag_path):
+                # no validator recorded (legacy download); keep the local copy
+                return f"✅ Archive already present (no ETag to revalidate): {out_path}"
+            with open(etag_path, "r", encoding="utf-8") as f:
+                headers["If-None-Match"] = f.read().strip()
+
+        # Stream in 1 MiB chunks so peak memory is one chunk, not the whole archive.
+        # Write to a temp file first so an interrupted download is never mistaken for a complete one.
+        tmp_path = out_path + ".part"
+        try:
+            with requests.get(url, timeout=timeout, stream=True, headers=headers) as resp:
+                if resp.status_code == 304:
+                    return f"✅ Archive unchanged on server (ETag match): {out_path}"
+                resp.raise_for_status()  # HTTP errors (404/500, moved URL) always propagate
+                with open(tmp_path, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                etag = resp.headers.get("ETag")
+            os.replace(tmp_path, out_path)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if have_file:
+                # network-level failure (e.g. offline); fall back to the cached archive
+                return f"⚠️ Could not revalidate archive ({e}); using cached copy: {out_path}"
+            raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        if etag:
+            with open(etag_path, "w", encoding="utf-8") as f:
+                f.write(etag)
+        elif os.path.exists(etag_path):
+            os.remove(etag_path)
+        return f"📥 Downloaded archive: {out_path}"
 
     @staticmethod
     def _safe_extract(tar_path: str, extract_dir: str) -> None:
@@ -249,25 +321,33 @@ class AnnotationInspector:
             abs_target = os.path.abspath(target)
             return os.path.commonprefix([abs_directory, abs_target]) == abs_directory
 
-        with tarfile.open(tar_path, "r:gz") as tar:
-            for member in tar.getmembers():
+        # Python >= 3.12 (and security backports) ship tarfile's "data" filter, which
+        # additionally rejects absolute links, device files, and unsafe permissions.
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+        # Streaming mode ("r|gz"): validate and extract each member in a single
+        # decompression pass instead of indexing the archive and then re-reading it.
+        with tarfile.open(tar_path, "r|gz") as tar:
+            for member in tar:
                 member_path = os.path.join(extract_dir, member.name)
                 if not is_within_directory(extract_dir, member_path):
                     raise Exception("Potential path traversal detected in tar file")
-            tar.extractall(path=extract_dir)
+                if member.islnk() and os.path.lexists(member_path):
+                    # os.link() fails on an existing path (e.g. a re-run), and tarfile's fallback
+                    # re-reads the link target, which needs a backwards seek a stream can't do
+                    os.remove(member_path)
+                tar.extract(member, path=extract_dir, **extract_kwargs)
 
     @staticmethod
     def _discover_rda(root: str) -> Tuple[str, str]:
-        cand_loc, cand_other = None, None
-        for dirpath, _, filenames in os.walk(root):
-            for fn in filenames:
-                low = fn.lower()
-                if low == "locations.rda":
-                    cand_loc = os.path.join(dirpath, fn)
-                elif low == "other.rda":
-                    cand_other = os.path.join(dirpath, fn)
-            if cand_loc and cand_other:
-                break
+        def find_first(filename: str) -> Optional[str]:
+            # Case-insensitive glob pattern (e.g. "[Oo][Tt]..."); stop at the first hit
+            pattern = "".join(f"[{c.lower()}{c.upper()}]" if c.isalpha() else c for c in filename)
+            hit = next(Path(root).rglob(pattern), None)
+            return str(hit) if hit else None
+
+        cand_loc = find_first("Locations.rda")
+        cand_other = find_first("Other.rda") if cand_loc else None
         if not (cand_loc and cand_other):
             raise FileNotFoundError("Could not locate Locations.rda and Other.rda in extracted archive.")
         return cand_loc, cand_other
@@ -282,9 +362,31 @@ class AnnotationInspector:
         merged = merged.reset_index().rename(columns={"index": "CpG"})
         return merged
 
+    @staticmethod
+    def _r_has_data_table() -> bool:
+        return bool(r("requireNamespace('data.table', quietly = TRUE)")[0])
+
+    @staticmethod
+    def _merge_and_export_in_r(locations_path: str, other_path: str, output_csv: str) -> None:
+        loc_r_path = locations_path.replace("\\", "/")
+        other_r_path = other_path.replace("\\", "/")
+        out_r_path = output_csv.replace("\\", "/")
+        r(f"suppressPackageStartupMessages(load('{loc_r_path}'))")
+        r(f"suppressPackageStartupMessages(load('{other_r_path}'))")
+        # Inner join on probe ID (row names -> CpG), Locations columns first, then a
+        # multi-threaded C CSV writer; mirrors _merge_annotation_frames + to_csv.
+        r(
+            "local({"
+            " L <- data.table::as.data.table(as.data.frame(Locations), keep.rownames = 'CpG');"
+            " O <- data.table::as.data.table(as.data.frame(Other), keep.rownames = 'CpG');"
+            " M <- merge(L, O, by = 'CpG', sort = FALSE);"
+            f" data.table::fwrite(M, '{out_r_path}')"
+            " })"
+        )
+
     @staticmethod
     def _load_rda_to_dfs(locations_path: str, other_path: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        pandas2ri.activate()
+        _activate_pandas2ri()
         # --- Patch: precompute R-friendly paths to avoid f-string backslash expressions ---
         loc_r_path = locations_path.replace("\\", "/")
         other_r_path = other_path.replace("\\", "/")
@@ -339,6 +441,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="If set, attempts to load Locations.rda and Other.rda via rpy2 and export merged CSV",
     )
+    parser.add_argument(
+        "--no-monitor",
+        action="store_true",
+        help="Disable system resource monitoring logs",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -355,13 +462,20 @@ def main() -> None:
     os.makedirs(args.results_dir, exist_ok=True)
     label = args.geo_id if args.geo_id else args.tag
     log_file = os.path.join(args.results_dir, f"s00007_extract_annotation_{label}.txt")
-    logging.basicConfig(filename=log_file, filemode="w", level=getattr(logging, args.log_level), format="%(message)s")
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, args.log_level))
+    # Buffer file writes (flushed every 256 records, on ERROR, and at exit); console stays live
+    file_handler = logging.FileHandler(log_file, mode="w")
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    buffered = logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=file_handler)
+    root.addHandler(buffered)
+    atexit.register(buffered.flush)
     console = logging.StreamHandler()
     console.setFormatter(logging.Formatter("%(message)s"))
-    logging.getLogger().addHandler(console)
+    root.addHandler(console)
 
     file_logger = FileLogger()
-    monitor = SystemMonitor(file_logger)
+    monitor = NullMonitor(file_logger) if args.no_monitor else SystemMonitor(file_logger)
 
     # Initial environment report to both file and console
     file_logger.log(f"🕓 Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")